@@ -3,11 +3,13 @@ Generate realistic synthetic data for pasture management system.
 Includes farms, fields, sensors, and time-series telemetry with realistic patterns.
 """
 
+import math
 import numpy as np
-import random
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional
 
 
 @dataclass
@@ -32,6 +34,177 @@ class FieldConfig:
     slope_degrees: float
     aspect: str
     species: List[str]
+    elevation_m: int = 0
+    polygon: Optional[List[List[float]]] = None  # Boundary ring, cached at creation
+
+
+# Cycle lookup tables (one full period each), indexed by hour/day
+_HOURLY_SIN = np.sin(np.arange(24) / 24 * 2 * np.pi - np.pi/2)  # Daily temperature
+_SOLAR_SIN = np.sin((np.arange(24) - 6) / 12 * np.pi)  # Daylight curve
+_SEASONAL_SIN = np.sin(np.arange(60) / 30 * np.pi)  # Seasonal temperature
+
+
+def simulate_sensor_metrics(slope_factor: float, soil_ph: float, has_drought_stress: bool,
+                            has_nutrient_deficiency: bool, noise: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute all sensor metrics for one field from pre-drawn noise grids.
+    Pure array math with no RNG calls; every grid has shape (num_days, readings_per_day).
+    """
+    num_days, readings_per_day = shape = noise['temperature'].shape
+    day_idx = np.arange(num_days)[:, None]
+    hour_idx = np.arange(readings_per_day)[None, :]
+    
+    # Temperature (Celsius) - daily cycle
+    base_temp = 15 + 10 * _SEASONAL_SIN[day_idx % 60]  # Seasonal
+    hourly_temp = base_temp + 8 * _HOURLY_SIN[hour_idx % 24]  # Daily
+    temperature = np.round(hourly_temp + noise['temperature'], 1)
+    
+    # Humidity (%) - inversely related to temperature
+    base_humidity = 70 - (temperature - 15) * 1.5
+    humidity = np.round(np.clip(base_humidity + noise['humidity'], 30, 95), 1)
+    
+    # Soil moisture (%) - affected by precipitation and slope
+    base_moisture = 25 - slope_factor * 10  # Slopes drain faster
+    if has_drought_stress:
+        base_moisture -= 8
+    
+    # Decrease over time, occasional rain events (10% chance)
+    moisture_trend = np.broadcast_to(base_moisture - (day_idx / num_days) * 10, shape)
+    rain = noise['rain_chance'] < 0.1
+    moisture_trend = moisture_trend + np.where(rain, noise['rain_amount'], 0.0)
+    
+    soil_moisture = np.round(np.clip(moisture_trend + noise['soil_moisture'], 5, 45), 1)
+    
+    # NDVI (0-1) - related to moisture and temperature
+    base_ndvi = 0.75 - slope_factor * 0.15
+    if has_drought_stress:
+        base_ndvi -= 0.2
+    base_ndvi = base_ndvi - np.where(soil_moisture < 15, 0.1, 0.0)
+    
+    ndvi = np.round(np.clip(base_ndvi + noise['ndvi'], 0.2, 0.9), 2)
+    
+    # Grass height (cm) - grows over time, affected by conditions
+    base_height = 8 + (day_idx / num_days) * 8
+    stressed = has_drought_stress | (soil_moisture < 15)
+    base_height = np.where(stressed, base_height * 0.7, base_height)
+    
+    grass_height = np.round(np.clip(base_height + noise['grass_height'], 4, 25), 1)
+    
+    # Soil pH - relatively stable
+    soil_ph_reading = np.round(soil_ph + noise['soil_ph'], 1)
+    
+    # Nutrients (ppm)
+    n_base = 45 if not has_nutrient_deficiency else 25
+    soil_nitrogen = np.round(n_base + noise['soil_nitrogen'], 1)
+    soil_phosphorus = np.round(25 + noise['soil_phosphorus'], 1)
+    soil_potassium = np.round(150 + noise['soil_potassium'], 1)
+    
+    # Solar radiation (W/m²) - daytime only
+    daytime = (hour_idx >= 6) & (hour_idx <= 18)
+    solar_radiation = np.where(
+        daytime,
+        np.round(800 * _SOLAR_SIN[hour_idx % 24] + noise['solar_radiation'], 1),
+        0.0
+    )
+    
+    # Wind speed (m/s)
+    wind_speed = np.round(np.clip(3 + noise['wind_speed'], 0, 15), 1)
+    
+    return {
+        'temperature': temperature,
+        'humidity': humidity,
+        'soil_moisture': soil_moisture,
+        'ndvi': ndvi,
+        'grass_height': grass_height,
+        'soil_ph': soil_ph_reading,
+        'soil_nitrogen': soil_nitrogen,
+        'soil_phosphorus': soil_phosphorus,
+        'soil_potassium': soil_potassium,
+        'solar_radiation': solar_radiation,
+        'wind_speed': wind_speed
+    }
+
+
+@lru_cache(maxsize=32)
+def timestamp_grid(start_date: datetime, num_days: int, readings_per_day: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reading timestamps and their day buckets for one generation window.
+    Cached per (start_date, num_days, readings_per_day), so every field generated
+    from the same anchor shares one grid. The returned arrays are read-only.
+    """
+    # Flatten grids row-major so readings stay ordered by timestamp
+    hour_offsets = (np.arange(num_days)[:, None] * 24 + np.arange(readings_per_day)[None, :]).ravel()
+    timestamps64 = np.datetime64(start_date, 'us') + hour_offsets.astype('timedelta64[h]')
+    timestamps = timestamps64.astype(object)
+    
+    # Day partition bucket per timestamp; one str object per distinct day
+    days, day_index = np.unique(timestamps64.astype('datetime64[D]'), return_inverse=True)
+    day_buckets = np.array([str(day) for day in days], dtype=object)[day_index]
+    
+    timestamps.flags.writeable = False
+    day_buckets.flags.writeable = False
+    return timestamps, day_buckets
+
+
+def generate_sensor_columns(field: FieldConfig, start_date: datetime, num_days: int,
+                            readings_per_day: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Generate sensor data for a field as parallel column arrays.
+    One entry per reading, ordered by timestamp then metric.
+    """
+    # Field-specific characteristics that influence sensors
+    slope_factor = field.slope_degrees / 15.0  # 0-1 scale
+    ph_factor = (field.soil_ph - 5.5) / 2.0  # 0-1 scale
+    
+    # Determine if this field has issues (20% chance)
+    has_drought_stress = rng.random() < 0.2
+    has_nutrient_deficiency = rng.random() < 0.15
+    
+    # Draw all noise up front, then run the pure-numeric simulation kernel
+    shape = (num_days, readings_per_day)
+    noise = {
+        'temperature': rng.normal(0, 1.5, shape),
+        'humidity': rng.normal(0, 5, shape),
+        'rain_chance': rng.random(shape),
+        'rain_amount': rng.uniform(5, 15, shape),
+        'soil_moisture': rng.normal(0, 2, shape),
+        'ndvi': rng.normal(0, 0.05, shape),
+        'grass_height': rng.normal(0, 1, shape),
+        'soil_ph': rng.normal(0, 0.1, shape),
+        'soil_nitrogen': rng.normal(0, 5, shape),
+        'soil_phosphorus': rng.normal(0, 3, shape),
+        'soil_potassium': rng.normal(0, 10, shape),
+        'solar_radiation': rng.normal(0, 50, shape),
+        'wind_speed': rng.exponential(2, shape)
+    }
+    metrics = simulate_sensor_metrics(
+        slope_factor, field.soil_ph, has_drought_stress, has_nutrient_deficiency, noise
+    )
+    
+    timestamps, day_buckets = timestamp_grid(start_date, num_days, readings_per_day)
+    num_readings = len(timestamps) * len(metrics)
+    
+    # Object arrays repeat references to the same str objects, so a field only
+    # ever allocates its 11 sensor_id strings (and .tolist() creates no new ones)
+    metric_types = np.array(list(metrics), dtype=object)
+    sensor_ids = np.array([f"sensor_{m}_{field.field_id}" for m in metrics], dtype=object)
+    
+    return {
+        'field_id': np.full(num_readings, field.field_id, dtype=object),
+        'bucket_day': np.repeat(day_buckets, len(metrics)),
+        'timestamp': np.repeat(timestamps, len(metrics)),
+        'sensor_id': np.tile(sensor_ids, len(timestamps)),
+        'metric_type': np.tile(metric_types, len(timestamps)),
+        'metric_value': np.stack([metrics[m].ravel() for m in metrics], axis=1).ravel(),
+        'quality_flag': (rng.random(num_readings) > 0.05).astype(np.int8)  # 5% bad readings
+    }
+
+
+def generate_sensor_columns_seeded(field: FieldConfig, start_date: datetime, num_days: int,
+                                   readings_per_day: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Generate one field's columns from its own seed, independent of any other field."""
+    return generate_sensor_columns(field, start_date, num_days, readings_per_day,
+                                   np.random.default_rng(seed))
 
 
 class PastureDataGenerator:
@@ -61,17 +234,33 @@ class PastureDataGenerator:
     
     def __init__(self, num_farms=5, seed=42):
         """Initialize generator with configuration."""
-        random.seed(seed)
-        np.random.seed(seed)
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_seq)
         self.num_farms = num_farms
         self.farms: List[FarmConfig] = []
         self.fields: List[FieldConfig] = []
         self.farmers: List[Dict] = []
+        self._farm_docs: Optional[List[Dict]] = None
+        self._field_docs: Optional[List[Dict]] = None
         
         self._generate_farm_structure()
     
     def _generate_farm_structure(self):
         """Generate farms, fields, and farmers."""
+        # Draw every per-farm and per-field random value up front
+        fields_per_farm = self.rng.integers(3, 6, self.num_farms).tolist()
+        total_fields = sum(fields_per_farm)
+        offsets_lon = self.rng.uniform(-0.02, 0.02, total_fields).tolist()
+        offsets_lat = self.rng.uniform(-0.01, 0.01, total_fields).tolist()
+        areas = np.round(self.rng.uniform(15.0, 40.0, total_fields), 1).tolist()
+        soil_phs = np.round(self.rng.uniform(5.5, 7.5, total_fields), 1).tolist()
+        slopes = np.round(self.rng.uniform(0, 15, total_fields), 1).tolist()
+        soil_types = self.rng.choice(self.SOIL_TYPES, total_fields).tolist()
+        aspects = self.rng.choice(self.ASPECTS, total_fields).tolist()
+        species_idx = self.rng.choice(len(self.SPECIES), total_fields).tolist()  # Pairs stay lists
+        elevations = self.rng.integers(50, 301, total_fields).tolist()
+        
+        k = 0  # Running index into the per-field draws
         for i in range(self.num_farms):
             # Create farmer
             farmer_id = f"farmer_{i+1:03d}"
@@ -86,7 +275,7 @@ class PastureDataGenerator:
             })
             
             # Create farm
-            num_fields = random.randint(3, 5)
+            num_fields = fields_per_farm[i]
             location = self.BASE_LOCATIONS[i % len(self.BASE_LOCATIONS)]
             
             farm = FarmConfig(
@@ -102,11 +291,9 @@ class PastureDataGenerator:
                 field_id = f"field_{i+1:03d}_{j+1:02d}"
                 
                 # Offset location slightly for each field
-                offset_lon = random.uniform(-0.02, 0.02)
-                offset_lat = random.uniform(-0.01, 0.01)
                 field_location = (
-                    location[0] + offset_lon,
-                    location[1] + offset_lat
+                    location[0] + offsets_lon[k],
+                    location[1] + offsets_lat[k]
                 )
                 
                 field = FieldConfig(
@@ -114,19 +301,22 @@ class PastureDataGenerator:
                     farm_id=farm_id,
                     name=f"Pasture {chr(65+j)}",  # A, B, C, etc.
                     center_location=field_location,
-                    area_hectares=round(random.uniform(15.0, 40.0), 1),
-                    soil_type=random.choice(self.SOIL_TYPES),
-                    soil_ph=round(random.uniform(5.5, 7.5), 1),
-                    slope_degrees=round(random.uniform(0, 15), 1),
-                    aspect=random.choice(self.ASPECTS),
-                    species=random.choice(self.SPECIES)
+                    area_hectares=areas[k],
+                    soil_type=soil_types[k],
+                    soil_ph=soil_phs[k],
+                    slope_degrees=slopes[k],
+                    aspect=aspects[k],
+                    species=self.SPECIES[species_idx[k]],
+                    elevation_m=elevations[k]
                 )
+                field.polygon = self.generate_polygon(field.center_location, field.area_hectares)
                 self.fields.append(field)
+                k += 1
     
     def generate_polygon(self, center: Tuple[float, float], area_hectares: float) -> List[List[float]]:
         """Generate a roughly square polygon for a field boundary."""
         # Approximate side length in degrees (very rough)
-        side_deg = np.sqrt(area_hectares / 10000) * 0.01
+        side_deg = math.sqrt(area_hectares / 10000) * 0.01
         
         lon, lat = center
         polygon = [
@@ -144,148 +334,95 @@ class PastureDataGenerator:
         Generate realistic time-series sensor data for a field.
         Includes seasonal patterns, weather variations, and correlations.
         """
-        sensor_data = []
-        
-        # Field-specific characteristics that influence sensors
-        slope_factor = field.slope_degrees / 15.0  # 0-1 scale
-        ph_factor = (field.soil_ph - 5.5) / 2.0  # 0-1 scale
-        
-        # Determine if this field has issues (20% chance)
-        has_drought_stress = random.random() < 0.2
-        has_nutrient_deficiency = random.random() < 0.15
-        
-        for day in range(num_days):
-            current_date = start_date + timedelta(days=day)
-            
-            # Daily weather pattern (temperature cycle)
-            for hour in range(readings_per_day):
-                timestamp = current_date + timedelta(hours=hour)
-                
-                # Temperature (Celsius) - daily cycle
-                base_temp = 15 + 10 * np.sin((day / 30) * np.pi)  # Seasonal
-                hourly_temp = base_temp + 8 * np.sin((hour / 24) * 2 * np.pi - np.pi/2)  # Daily
-                temperature = round(hourly_temp + np.random.normal(0, 1.5), 1)
-                
-                # Humidity (%) - inversely related to temperature
-                base_humidity = 70 - (temperature - 15) * 1.5
-                humidity = round(np.clip(base_humidity + np.random.normal(0, 5), 30, 95), 1)
-                
-                # Soil moisture (%) - affected by precipitation and slope
-                base_moisture = 25 - slope_factor * 10  # Slopes drain faster
-                if has_drought_stress:
-                    base_moisture -= 8
-                
-                # Decrease over time, occasional rain events
-                moisture_trend = base_moisture - (day / num_days) * 10
-                if random.random() < 0.1:  # 10% chance of rain
-                    moisture_trend += random.uniform(5, 15)
-                
-                soil_moisture = round(np.clip(moisture_trend + np.random.normal(0, 2), 5, 45), 1)
-                
-                # NDVI (0-1) - related to moisture and temperature
-                base_ndvi = 0.75 - slope_factor * 0.15
-                if has_drought_stress:
-                    base_ndvi -= 0.2
-                if soil_moisture < 15:
-                    base_ndvi -= 0.1
-                
-                ndvi = round(np.clip(base_ndvi + np.random.normal(0, 0.05), 0.2, 0.9), 2)
-                
-                # Grass height (cm) - grows over time, affected by conditions
-                base_height = 8 + (day / num_days) * 8
-                if has_drought_stress or soil_moisture < 15:
-                    base_height *= 0.7
-                
-                grass_height = round(np.clip(base_height + np.random.normal(0, 1), 4, 25), 1)
-                
-                # Soil pH - relatively stable
-                soil_ph_reading = round(field.soil_ph + np.random.normal(0, 0.1), 1)
-                
-                # Nutrients (ppm)
-                n_base = 45 if not has_nutrient_deficiency else 25
-                soil_nitrogen = round(n_base + np.random.normal(0, 5), 1)
-                soil_phosphorus = round(25 + np.random.normal(0, 3), 1)
-                soil_potassium = round(150 + np.random.normal(0, 10), 1)
-                
-                # Solar radiation (W/m²) - daytime only
-                if 6 <= hour <= 18:
-                    solar_radiation = round(800 * np.sin((hour - 6) / 12 * np.pi) + np.random.normal(0, 50), 1)
-                else:
-                    solar_radiation = 0.0
-                
-                # Wind speed (m/s)
-                wind_speed = round(np.clip(3 + np.random.exponential(2), 0, 15), 1)
-                
-                # Generate readings for multiple sensors
-                metrics = {
-                    'temperature': temperature,
-                    'humidity': humidity,
-                    'soil_moisture': soil_moisture,
-                    'ndvi': ndvi,
-                    'grass_height': grass_height,
-                    'soil_ph': soil_ph_reading,
-                    'soil_nitrogen': soil_nitrogen,
-                    'soil_phosphorus': soil_phosphorus,
-                    'soil_potassium': soil_potassium,
-                    'solar_radiation': solar_radiation,
-                    'wind_speed': wind_speed
-                }
-                
-                for metric_type, value in metrics.items():
-                    sensor_data.append({
-                        'field_id': field.field_id,
-                        'timestamp': timestamp,
-                        'sensor_id': f"sensor_{metric_type}_{field.field_id}",
-                        'metric_type': metric_type,
-                        'metric_value': value,
-                        'quality_flag': 1 if random.random() > 0.05 else 0  # 5% bad readings
-                    })
-        
-        return sensor_data
+        columns = self.generate_sensor_data_columnar(field, start_date, num_days, readings_per_day)
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*(columns[k].tolist() for k in keys))]
+    
+    def generate_sensor_data_columnar(self, field: FieldConfig, start_date: datetime,
+                                      num_days=30, readings_per_day=24) -> Dict[str, np.ndarray]:
+        """Generate sensor data for a field as parallel column arrays."""
+        return generate_sensor_columns(field, start_date, num_days, readings_per_day, self.rng)
+    
+    def spawn_sensor_seeds(self, count: int) -> List[np.random.SeedSequence]:
+        """Spawn independent child seeds, one per field, for generate_sensor_columns_seeded."""
+        return self.seed_seq.spawn(count)
     
     def generate_treatment_events(self, fields: List[FieldConfig], 
                                  start_date: datetime, num_days=30) -> List[Dict]:
         """Generate realistic treatment events (fertilizer, irrigation, etc.)."""
         events = []
         
-        for field in fields:
-            # Fertilizer application (1-2 times per field)
-            num_fertilizer = random.randint(0, 2)
-            for _ in range(num_fertilizer):
-                event_date = start_date + timedelta(days=random.randint(0, num_days-1))
+        # Per field: 0-2 fertilizer applications, and 1-3 irrigations for 70% of fields
+        num_fertilizer = self.rng.integers(0, 3, len(fields)).tolist()
+        num_irrigation = np.where(
+            self.rng.random(len(fields)) < 0.7, self.rng.integers(1, 4, len(fields)), 0
+        ).tolist()
+        
+        # Draw every event detail in bulk, then consume the draws in order
+        total_fert = sum(num_fertilizer)
+        fert_days = iter(self.rng.integers(0, num_days, total_fert).tolist())
+        fert_types = iter(self.rng.choice(['NPK', 'Urea', 'Organic'], total_fert).tolist())
+        n_rates = iter(self.rng.integers(30, 81, total_fert).tolist())
+        p_rates = iter(self.rng.integers(15, 41, total_fert).tolist())
+        k_rates = iter(self.rng.integers(15, 41, total_fert).tolist())
+        
+        total_irr = sum(num_irrigation)
+        irr_days = iter(self.rng.integers(0, num_days, total_irr).tolist())
+        irr_amounts = iter(self.rng.integers(15, 41, total_irr).tolist())
+        irr_methods = iter(self.rng.choice(['sprinkler', 'drip', 'flood'], total_irr).tolist())
+        
+        for field, n_fert, n_irr in zip(fields, num_fertilizer, num_irrigation):
+            # Fertilizer application
+            for _ in range(n_fert):
+                event_date = start_date + timedelta(days=next(fert_days))
                 events.append({
                     'event_id': f"evt_{field.field_id}_{len(events)}",
                     'field_id': field.field_id,
                     'event_type': 'fertilizer',
                     'event_date': event_date.isoformat(),
                     'details': {
-                        'fertilizer_type': random.choice(['NPK', 'Urea', 'Organic']),
-                        'n_kg_per_ha': random.randint(30, 80),
-                        'p_kg_per_ha': random.randint(15, 40),
-                        'k_kg_per_ha': random.randint(15, 40)
+                        'fertilizer_type': next(fert_types),
+                        'n_kg_per_ha': next(n_rates),
+                        'p_kg_per_ha': next(p_rates),
+                        'k_kg_per_ha': next(k_rates)
                     }
                 })
             
-            # Irrigation (0-3 times)
-            if random.random() < 0.7:  # 70% of fields get irrigation
-                num_irrigation = random.randint(1, 3)
-                for _ in range(num_irrigation):
-                    event_date = start_date + timedelta(days=random.randint(0, num_days-1))
-                    events.append({
-                        'event_id': f"evt_{field.field_id}_{len(events)}",
-                        'field_id': field.field_id,
-                        'event_type': 'irrigation',
-                        'event_date': event_date.isoformat(),
-                        'details': {
-                            'amount_mm': random.randint(15, 40),
-                            'method': random.choice(['sprinkler', 'drip', 'flood'])
-                        }
-                    })
+            # Irrigation
+            for _ in range(n_irr):
+                event_date = start_date + timedelta(days=next(irr_days))
+                events.append({
+                    'event_id': f"evt_{field.field_id}_{len(events)}",
+                    'field_id': field.field_id,
+                    'event_type': 'irrigation',
+                    'event_date': event_date.isoformat(),
+                    'details': {
+                        'amount_mm': next(irr_amounts),
+                        'method': next(irr_methods)
+                    }
+                })
         
         return events
     
     def get_all_farms(self) -> List[Dict]:
         """Get all farm data in MongoDB format."""
+        if self._farm_docs is None:
+            self._farm_docs = self._build_farm_docs()
+        # Shallow copies: insert_many adds an _id to each document it is given
+        return [dict(doc) for doc in self._farm_docs]
+    
+    def get_all_fields(self) -> List[Dict]:
+        """Get all field data in MongoDB format."""
+        if self._field_docs is None:
+            self._field_docs = self._build_field_docs()
+        return [dict(doc) for doc in self._field_docs]
+    
+    def _build_farm_docs(self) -> List[Dict]:
+        """Build farm documents once; farms are immutable after generation."""
+        areas_by_farm = defaultdict(float)
+        for field in self.fields:
+            areas_by_farm[field.farm_id] += field.area_hectares
+        
         return [{
             'farm_id': farm.farm_id,
             'name': farm.name,
@@ -293,25 +430,26 @@ class PastureDataGenerator:
                 'type': 'Point',
                 'coordinates': list(farm.location)
             },
-            'total_area_hectares': sum(f.area_hectares for f in self.fields if f.farm_id == farm.farm_id),
+            'total_area_hectares': areas_by_farm[farm.farm_id],
             'established_date': '2010-01-01'
         } for farm in self.farms]
     
-    def get_all_fields(self) -> List[Dict]:
-        """Get all field data in MongoDB format."""
+    def _build_field_docs(self) -> List[Dict]:
+        """Build field documents once; fields are immutable after generation."""
         return [{
             'field_id': field.field_id,
             'farm_id': field.farm_id,
             'name': field.name,
             'boundary': {
                 'type': 'Polygon',
-                'coordinates': [self.generate_polygon(field.center_location, field.area_hectares)]
+                'coordinates': [field.polygon]
             },
+            'boundary_centroid': list(field.center_location),
             'area_hectares': field.area_hectares,
             'soil_type': field.soil_type,
             'soil_ph': field.soil_ph,
             'terrain': {
-                'elevation_m': random.randint(50, 300),
+                'elevation_m': field.elevation_m,
                 'slope_degrees': field.slope_degrees,
                 'aspect': field.aspect
             },
@@ -0,0 +1,60 @@
+"""
+Columnar row builders for Cassandra sensor inserts.
+Binds insert parameters straight from aligned column arrays (structure of arrays)
+instead of building a dict or datetime per reading.
+"""
+
+import numpy as np
+from datetime import date
+from typing import Iterator, Tuple
+
+
+# Column order matches the INSERT_SENSOR_DATA bind order
+SENSOR_COLUMNS = (
+    'field_id', 'bucket_day', 'timestamp', 'sensor_id',
+    'metric_type', 'metric_value', 'quality_flag'
+)
+
+
+def to_epoch_millis(timestamps) -> np.ndarray:
+    """Convert datetimes / datetime64 values to int64 epoch milliseconds."""
+    return np.asarray(timestamps, dtype='datetime64[ms]').astype(np.int64)
+
+
+def iter_param_rows(columns) -> Iterator[Tuple]:
+    """
+    Yield insert parameter tuples from sensor columns. Accepts the dict of arrays
+    from generate_sensor_columns or a pandas DataFrame with the same column names.
+    Timestamps are bound as epoch millis, which the driver sends as-is.
+    """
+    return zip(
+        np.asarray(columns['field_id']).tolist(),
+        np.asarray(columns['bucket_day']).tolist(),
+        to_epoch_millis(columns['timestamp']).tolist(),
+        np.asarray(columns['sensor_id']).tolist(),
+        np.asarray(columns['metric_type']).tolist(),
+        np.asarray(columns['metric_value'], dtype=np.float64).tolist(),
+        np.asarray(columns['quality_flag']).tolist()
+    )
+
+
+def daily_rollup_rows(columns) -> Iterator[Tuple]:
+    """
+    Yield INSERT_DAILY parameter tuples (field_id, metric_type, day, sum_value,
+    sample_count) summarizing one field's sensor columns per day and metric.
+    """
+    field_id = columns['field_id'][0]
+    days, day_idx = np.unique(np.asarray(columns['bucket_day']), return_inverse=True)
+    metrics, metric_idx = np.unique(np.asarray(columns['metric_type']), return_inverse=True)
+    
+    # One bincount slot per (day, metric) pair
+    group = day_idx * len(metrics) + metric_idx
+    size = len(days) * len(metrics)
+    sums = np.bincount(group, weights=np.asarray(columns['metric_value'], dtype=np.float64), minlength=size)
+    counts = np.bincount(group, minlength=size)
+    
+    day_dates = [date.fromisoformat(day) for day in days.tolist()]
+    for slot in np.flatnonzero(counts).tolist():
+        day, metric = divmod(slot, len(metrics))
+        yield field_id, metrics[metric], day_dates[day], float(sums[slot]), int(counts[slot])
+
@@ -3,8 +3,15 @@ Cassandra schema for high-throughput time-series sensor data.
 Optimized for write-heavy workloads and time-range queries.
 """
 
-from cassandra.cluster import Cluster
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from cassandra.cluster import Cluster, ExecutionProfile, EXEC_PROFILE_DEFAULT
 from cassandra.auth import PlainTextAuthProvider
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from cassandra.query import BatchStatement, BatchType
 
 
 # CQL Schema Definitions
@@ -19,21 +26,27 @@ WITH replication = {
 SENSOR_DATA_TABLE = """
 CREATE TABLE IF NOT EXISTS pasture_sensors.sensor_data_by_field (
     field_id text,
+    bucket_day text,
     sensor_ts timestamp,
     sensor_id text,
     metric_type text,
     metric_value double,
     quality_flag int,
-    PRIMARY KEY ((field_id), sensor_ts, sensor_id)
-) WITH CLUSTERING ORDER BY (sensor_ts DESC, sensor_id ASC)
+    PRIMARY KEY ((field_id, bucket_day), metric_type, sensor_ts, sensor_id)
+) WITH CLUSTERING ORDER BY (metric_type ASC, sensor_ts DESC, sensor_id ASC)
   AND compaction = {
       'class': 'TimeWindowCompactionStrategy',
-      'compaction_window_size': '1',
+      'compaction_window_size': '3',
       'compaction_window_unit': 'DAYS'
   }
-  AND default_time_to_live = 7776000;
+  AND default_time_to_live = 7776000
+  AND gc_grace_seconds = 3600;
 """
-# TTL = 90 days (7776000 seconds)
+# bucket_day = sensor_ts as 'YYYY-MM-DD', so each field spreads its writes over
+# one partition per day instead of a single ever-growing hot partition.
+# Clustering by metric_type first makes one metric's time range a contiguous slice.
+# TTL = 90 days (7776000 seconds), 3-day windows -> 30 SSTable buckets
+# Append-only and TTLed, so a short gc_grace lets expired SSTables drop sooner
 
 AGGREGATED_METRICS_TABLE = """
 CREATE TABLE IF NOT EXISTS pasture_sensors.aggregated_metrics_by_field (
@@ -47,9 +60,40 @@ CREATE TABLE IF NOT EXISTS pasture_sensors.aggregated_metrics_by_field (
     sample_count int,
     PRIMARY KEY ((field_id, date), hour, metric_type)
 ) WITH CLUSTERING ORDER BY (hour DESC, metric_type ASC)
-  AND default_time_to_live = 31536000;
+  AND compaction = {
+      'class': 'TimeWindowCompactionStrategy',
+      'compaction_window_size': '12',
+      'compaction_window_unit': 'DAYS'
+  }
+  AND default_time_to_live = 31536000
+  AND gc_grace_seconds = 3600;
 """
-# TTL = 365 days (31536000 seconds)
+# TTL = 365 days (31536000 seconds), 12-day windows -> ~30 SSTable buckets
+
+SENSOR_DAILY_TABLE = """
+CREATE TABLE IF NOT EXISTS pasture_sensors.sensor_daily_by_field (
+    field_id text,
+    metric_type text,
+    day date,
+    sum_value double,
+    sample_count int,
+    PRIMARY KEY ((field_id, metric_type), day)
+) WITH CLUSTERING ORDER BY (day ASC)
+  AND default_time_to_live = 31536000
+  AND gc_grace_seconds = 3600;
+"""
+# Per-day rollup written at ingest; average = sum_value / sample_count.
+# A metric's whole history is one partition, read as a single day-range slice.
+
+# Primary key of SENSOR_DATA_TABLE as system_schema.columns reports it:
+# (kind, position, column_name, clustering_order)
+SENSOR_DATA_KEY = [
+    ('clustering', 0, 'metric_type', 'asc'),
+    ('clustering', 1, 'sensor_ts', 'desc'),
+    ('clustering', 2, 'sensor_id', 'asc'),
+    ('partition_key', 0, 'field_id', 'none'),
+    ('partition_key', 1, 'bucket_day', 'none')
+]
 
 # Metric types we track
 METRIC_TYPES = [
@@ -74,6 +118,11 @@ def init_cassandra_schema(session):
     session.execute(KEYSPACE_SCHEMA)
     print("Keyspace created")
     
+    # CREATE TABLE IF NOT EXISTS keeps a table with an older primary key, which
+    # the prepared bucket_day inserts and selects would then fail against
+    if _drop_if_key_changed(session, 'sensor_data_by_field', SENSOR_DATA_KEY):
+        print("sensor_data_by_field had an outdated primary key; dropped for recreation")
+    
     # Create tables
     session.execute(SENSOR_DATA_TABLE)
     print("sensor_data_by_field table created")
@@ -81,15 +130,190 @@ def init_cassandra_schema(session):
     session.execute(AGGREGATED_METRICS_TABLE)
     print("aggregated_metrics_by_field table created")
     
+    session.execute(SENSOR_DAILY_TABLE)
+    print("sensor_daily_by_field table created")
+    
     print("Cassandra schema initialized successfully")
 
 
+def _drop_if_key_changed(session, table, expected_key):
+    """Drop pasture_sensors.<table> if it exists with a primary key other than expected_key."""
+    rows = session.execute("""
+        SELECT kind, position, column_name, clustering_order
+        FROM system_schema.columns
+        WHERE keyspace_name = 'pasture_sensors' AND table_name = %s
+    """, (table,))
+    key = sorted(
+        (row.kind, row.position, row.column_name, row.clustering_order)
+        for row in rows if row.kind != 'regular'
+    )
+    if not key or key == sorted(expected_key):
+        return False
+    
+    session.execute(f"DROP TABLE pasture_sensors.{table}")
+    return True
+
+
+# Parameterized inserts, prepared once per session by prepare_statements()
+INSERT_SENSOR_DATA = """
+INSERT INTO pasture_sensors.sensor_data_by_field
+    (field_id, bucket_day, sensor_ts, sensor_id, metric_type, metric_value, quality_flag)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_AGGREGATED = """
+INSERT INTO pasture_sensors.aggregated_metrics_by_field
+    (field_id, date, hour, metric_type, avg_value, min_value, max_value, sample_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_DAILY = """
+INSERT INTO pasture_sensors.sensor_daily_by_field
+    (field_id, metric_type, day, sum_value, sample_count)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# Max in-flight requests for write_rows()
+WRITE_CONCURRENCY = 128
+
+# Rows per page for range reads; the driver fetches the next page as iteration reaches it
+READ_FETCH_SIZE = 5000
+
+
+def prepare_statements(session):
+    """Prepare the insert statements (call after init_cassandra_schema)."""
+    return {
+        'sensor': session.prepare(INSERT_SENSOR_DATA),
+        'agg': session.prepare(INSERT_AGGREGATED),
+        'daily': session.prepare(INSERT_DAILY)
+    }
+
+
+def write_rows(session, statement, rows, write_concurrency=WRITE_CONCURRENCY):
+    """Execute a prepared insert for every parameter tuple in rows concurrently."""
+    return execute_concurrent_with_args(session, statement, rows, concurrency=write_concurrency)
+
+
+def bucket_day(ts):
+    """Partition bucket for a sensor timestamp."""
+    return ts.strftime('%Y-%m-%d')
+
+
+def day_buckets(start, end):
+    """All bucket_day values covering [start, end], oldest first."""
+    first, last = start.date(), end.date()
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+def query_time_range(session, statement, field_id, start, end, concurrency=WRITE_CONCURRENCY,
+                     fetch_size=READ_FETCH_SIZE):
+    """
+    Run a prepared range query bound as (field_id, bucket_day, start, end) once per
+    day bucket in the range, concurrently. Yields rows newest bucket first, paged,
+    so only the current pages are held in memory rather than the whole range.
+    """
+    # Page size goes on each bound statement; the shared prepared statement is left untouched
+    statements = []
+    for day in reversed(day_buckets(start, end)):
+        bound = statement.bind((field_id, day, start, end))
+        bound.fetch_size = fetch_size
+        statements.append((bound, None))
+    results = execute_concurrent(
+        session, statements, concurrency=concurrency, results_generator=True
+    )
+    for _, result in results:
+        yield from result
+
+
+class SensorWriter:
+    """
+    Micro-batching writer for streaming sensor rows. Rows are buffered per
+    (field_id, bucket_day) partition and each partition's rows go out as one
+    UNLOGGED batch via execute_async; batches never span partitions.
+    """
+    
+    def __init__(self, session, prepared, max_batch=50, flush_ms=200, max_in_flight=128):
+        self.session = session
+        self.prepared = prepared
+        self.max_batch = max_batch
+        self.flush_ms = flush_ms
+        self.buf = defaultdict(list)  # (field_id, bucket_day) -> [params]
+        self.errors = []
+        self._lock = threading.Lock()  # Guards buf
+        self._timer_lock = threading.Lock()  # Guards _closed and _timer
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._max_in_flight = max_in_flight
+        self._closed = False
+        self._timer = None
+        self._schedule_flush()
+    
+    def write(self, params):
+        """Buffer one INSERT_SENSOR_DATA parameter tuple."""
+        partition = params[:2]
+        with self._lock:
+            rows = self.buf[partition]
+            rows.append(params)
+            full = self.buf.pop(partition) if len(rows) >= self.max_batch else None
+        if full:
+            self._send(full)
+    
+    def flush(self):
+        """Send every buffered partition now."""
+        with self._lock:
+            pending = list(self.buf.values())
+            self.buf.clear()
+        for rows in pending:
+            self._send(rows)
+    
+    def close(self):
+        """Stop the flush timer, send what is left and wait for all writes to finish."""
+        with self._timer_lock:
+            self._closed = True
+            self._timer.cancel()
+        self.flush()
+        for _ in range(self._max_in_flight):
+            self._in_flight.acquire()
+        for _ in range(self._max_in_flight):
+            self._in_flight.release()
+        if self.errors:
+            raise self.errors[0]
+    
+    def _send(self, rows):
+        # Called without self._lock held, so waiting for a free slot never blocks writers
+        batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+        for params in rows:
+            batch.add(self.prepared, params)
+        
+        self._in_flight.acquire()  # Back-pressure once max_in_flight batches are pending
+        future = self.session.execute_async(batch)
+        future.add_callbacks(self._on_done, self._on_error)
+    
+    def _on_done(self, _):
+        self._in_flight.release()
+    
+    def _on_error(self, exc):
+        self.errors.append(exc)
+        self._in_flight.release()
+    
+    def _schedule_flush(self):
+        with self._timer_lock:
+            if self._closed:
+                return
+            self._timer = threading.Timer(self.flush_ms / 1000, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _on_timer(self):
+        self.flush()
+        self._schedule_flush()
+
+
 # Example insert statements
 EXAMPLE_INSERT_SENSOR_DATA = """
 INSERT INTO pasture_sensors.sensor_data_by_field 
-    (field_id, sensor_ts, sensor_id, metric_type, metric_value, quality_flag)
+    (field_id, bucket_day, sensor_ts, sensor_id, metric_type, metric_value, quality_flag)
 VALUES 
-    ('field_001', '2024-12-10 10:30:00', 'sensor_temp_01', 'temperature', 18.5, 1)
+    ('field_001', '2024-12-10', '2024-12-10 10:30:00', 'sensor_temp_01', 'temperature', 18.5, 1)
 """
 
 EXAMPLE_INSERT_AGGREGATED = """
@@ -99,21 +323,38 @@ VALUES
     ('field_001', '2024-12-10', 10, 'soil_moisture', 22.3, 20.1, 24.5, 12)
 """
 
-# Example query for time range
+# Example query for time range: one statement per day bucket in the range,
+# run through query_time_range() so the buckets are read in parallel
 EXAMPLE_QUERY_TIME_RANGE = """
 SELECT sensor_ts, metric_type, metric_value 
 FROM pasture_sensors.sensor_data_by_field
-WHERE field_id = 'field_001'
-  AND sensor_ts >= '2024-12-01 00:00:00'
-  AND sensor_ts <= '2024-12-10 23:59:59'
-ORDER BY sensor_ts DESC
-LIMIT 1000
+WHERE field_id = ?
+  AND bucket_day = ?
+  AND metric_type = 'temperature'
+  AND sensor_ts >= ?
+  AND sensor_ts <= ?
 """
 
 
-def get_cassandra_session(contact_points=['localhost'], port=9042):
+def get_cassandra_cluster(contact_points=['localhost'], port=9042, local_dc='datacenter1'):
+    """Create a Cassandra cluster with the project's routing and wire settings (not yet connected)."""
+    # Token-aware routing sends each write straight to a replica for its
+    # partition key; LZ4 shrinks the repetitive sensor-row payloads on the wire.
+    profile = ExecutionProfile(
+        load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy(local_dc=local_dc)),
+        request_timeout=30
+    )
+    cluster = Cluster(
+        contact_points=contact_points, port=port,
+        execution_profiles={EXEC_PROFILE_DEFAULT: profile},
+        protocol_version=4, compression='lz4'
+    )
+    return cluster
+
+
+def get_cassandra_session(contact_points=['localhost'], port=9042, local_dc='datacenter1'):
     """Create and return a Cassandra session."""
-    cluster = Cluster(contact_points=contact_points, port=port)
+    cluster = get_cassandra_cluster(contact_points, port, local_dc)
     session = cluster.connect()
     return session, cluster
 
@@ -124,12 +365,21 @@ if __name__ == "__main__":
     init_cassandra_schema(session)
     
     # Example: Insert sample data
-    session.execute(EXAMPLE_INSERT_SENSOR_DATA)
-    session.execute(EXAMPLE_INSERT_AGGREGATED)
+    statements = prepare_statements(session)
+    sensor_ts = datetime(2024, 12, 10, 10, 30)
+    writer = SensorWriter(session, statements['sensor'])
+    writer.write(('field_001', bucket_day(sensor_ts), sensor_ts, 'sensor_temp_01', 'temperature', 18.5, 1))
+    writer.close()
+    write_rows(session, statements['agg'], [
+        ('field_001', '2024-12-10', 10, 'soil_moisture', 22.3, 20.1, 24.5, 12)
+    ])
     print("Example data inserted")
     
     # Example: Query data
-    rows = session.execute(EXAMPLE_QUERY_TIME_RANGE)
+    rows = query_time_range(
+        session, session.prepare(EXAMPLE_QUERY_TIME_RANGE), 'field_001',
+        datetime(2024, 12, 1), datetime(2024, 12, 10, 23, 59, 59)
+    )
     for row in rows:
         print(f"{row.sensor_ts}: {row.metric_type} = {row.metric_value}")
     
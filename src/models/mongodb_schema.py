@@ -3,7 +3,7 @@ MongoDB schema initialization and example documents.
 Collections: farms, fields, treatment_events, farmer_profiles
 """
 
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel, ASCENDING
 from datetime import datetime
 
 
@@ -15,12 +15,16 @@ def init_mongodb_schema(client: MongoClient):
     collections = {
         'farms': [
             {'field': 'farm_id', 'unique': True},
+            # $near / $geoWithin $geometry against farm points
             {'field': [('location', '2dsphere')], 'geo': True}
         ],
         'fields': [
             {'field': 'field_id', 'unique': True},
             {'field': 'farm_id'},
-            {'field': [('boundary', '2dsphere')], 'geo': True}
+            # $near / $geoWithin $geometry / $geoIntersects on GeoJSON polygons
+            {'field': [('boundary', '2dsphere')], 'geo': True},
+            # Legacy $geoWithin $box / $polygon / $center; 2dsphere cannot serve these
+            {'field': [('boundary_centroid', '2d')], 'geo': True}
         ],
         'treatment_events': [
             {'field': 'field_id'},
@@ -33,27 +37,44 @@ def init_mongodb_schema(client: MongoClient):
         ]
     }
     
+    # One createIndexes command per collection
     for coll_name, indexes in collections.items():
-        collection = db[coll_name]
+        models = []
         for idx_config in indexes:
             field = idx_config['field']
-            is_geo = idx_config.get('geo', False)
-            is_unique = idx_config.get('unique', False)
-            
-            if is_geo:
-                # Geospatial index (field is already a list of tuples)
-                collection.create_index(field)
-            elif is_unique:
-                # Unique index
-                collection.create_index(field, unique=True)
-            else:
-                # Regular index
-                collection.create_index(field)
+            # Geospatial/compound specs are already a list of (key, type) tuples
+            keys = field if isinstance(field, list) else [(field, ASCENDING)]
+            models.append(IndexModel(keys, unique=idx_config.get('unique', False)))
+        
+        db[coll_name].create_indexes(models)
+    
+    backfilled = backfill_boundary_centroids(db)
+    if backfilled:
+        print(f"Backfilled boundary_centroid on {backfilled} fields")
     
     print("MongoDB schema initialized successfully")
     return db
 
 
+def backfill_boundary_centroids(db):
+    """
+    One-time migration for fields stored before boundary_centroid existed.
+    The centroid (mean of the outer ring's vertices, closing vertex excluded) is
+    computed server-side in a single update, so queries never recompute it.
+    """
+    ring = {'$arrayElemAt': ['$boundary.coordinates', 0]}
+    vertices = {'$slice': [ring, {'$subtract': [{'$size': ring}, 1]}]}
+    
+    def mean_of(axis):
+        return {'$avg': {'$map': {'input': vertices, 'in': {'$arrayElemAt': ['$$this', axis]}}}}
+    
+    result = db.fields.update_many(
+        {'boundary_centroid': {'$exists': False}, 'boundary.type': 'Polygon'},
+        [{'$set': {'boundary_centroid': [mean_of(0), mean_of(1)]}}]
+    )
+    return result.modified_count
+
+
 # Example documents
 EXAMPLE_FARM = {
     "farm_id": "farm_001",
@@ -85,6 +106,7 @@ EXAMPLE_FIELD = {
             [-122.4204, 37.7759]
         ]]
     },
+    "boundary_centroid": [-122.4194, 37.7749],  # [longitude, latitude], for 2d bbox queries
     "area_hectares": 25.3,
     "soil_type": "loam",
     "soil_ph": 6.2,
@@ -3,234 +3,517 @@ Neo4j graph schema for modeling relationships between entities.
 Nodes: Farm, Field, Sensor, Farmer, Treatment, CropSpecies, AdvisoryRule
 """
 
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
 from neo4j import GraphDatabase
+from neo4j.exceptions import Neo4jError
+
+
+# Constraints and indexes created by init_schema
+SCHEMA_CONSTRAINTS = [
+    "CREATE CONSTRAINT farm_id IF NOT EXISTS FOR (f:Farm) REQUIRE f.farm_id IS UNIQUE",
+    "CREATE CONSTRAINT field_id IF NOT EXISTS FOR (f:Field) REQUIRE f.field_id IS UNIQUE",
+    "CREATE CONSTRAINT farmer_id IF NOT EXISTS FOR (f:Farmer) REQUIRE f.farmer_id IS UNIQUE",
+    "CREATE CONSTRAINT sensor_id IF NOT EXISTS FOR (s:Sensor) REQUIRE s.sensor_id IS UNIQUE",
+    "CREATE CONSTRAINT species_name IF NOT EXISTS FOR (s:CropSpecies) REQUIRE s.name IS UNIQUE",
+    "CREATE CONSTRAINT rule_id IF NOT EXISTS FOR (r:AdvisoryRule) REQUIRE r.rule_id IS UNIQUE",
+    # Range index for treatment date cutoffs (t.date is stored as a native temporal)
+    "CREATE INDEX treatment_date IF NOT EXISTS FOR (t:Treatment) ON (t.date)"
+]
+
+# Max rows per UNWIND transaction in the *_bulk methods
+BULK_CHUNK_SIZE = 10000
+
+# Worker threads per manager for run_concurrently()
+CONCURRENT_READ_WORKERS = 8
+
+# Bolt connection pool settings for the shared driver
+MAX_CONNECTION_POOL_SIZE = 128
+CONNECTION_ACQUISITION_TIMEOUT = 30  # seconds
+MAX_CONNECTION_LIFETIME = 3600  # seconds
+
+_drivers = {}
+_drivers_lock = threading.Lock()
+
+
+def get_driver(uri="bolt://localhost:7687", user="neo4j", password="password",
+               max_connection_pool_size=MAX_CONNECTION_POOL_SIZE,
+               connection_acquisition_timeout=CONNECTION_ACQUISITION_TIMEOUT):
+    """
+    Return the process-wide driver for these credentials and pool settings,
+    creating it on first use. Managers share it so one bounded Bolt pool serves every worker.
+    """
+    key = (uri, user, password, max_connection_pool_size, connection_acquisition_timeout)
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(
+                uri, auth=(user, password),
+                max_connection_pool_size=max_connection_pool_size,
+                connection_acquisition_timeout=connection_acquisition_timeout,
+                max_connection_lifetime=MAX_CONNECTION_LIFETIME
+            )
+            _drivers[key] = driver
+        return driver
+
+
+@atexit.register
+def close_drivers():
+    """Close every shared driver (runs at interpreter exit)."""
+    with _drivers_lock:
+        for driver in _drivers.values():
+            driver.close()
+        _drivers.clear()
+
+
+# ===== Cypher statements =====
+# Kept as module constants so each query is one identical string the server can
+# cache a plan for, instead of text rebuilt inside every method call.
+
+CREATE_FARM_CYPHER = """
+    MERGE (f:Farm {farm_id: $farm_id})
+    SET f.name = $name,
+        f.location = $location,
+        f.area_hectares = $area_hectares
+    RETURN f
+"""
+
+CREATE_FIELD_CYPHER = """
+    MERGE (f:Field {field_id: $field_id})
+    SET f.name = $name,
+        f.area_hectares = $area_hectares,
+        f.soil_type = $soil_type,
+        f.slope_degrees = $slope
+    RETURN f
+"""
+
+CREATE_FARMER_CYPHER = """
+    MERGE (f:Farmer {farmer_id: $farmer_id})
+    SET f.name = $name,
+        f.email = $email
+    RETURN f
+"""
+
+CREATE_SENSOR_CYPHER = """
+    MERGE (s:Sensor {sensor_id: $sensor_id})
+    SET s.type = $sensor_type,
+        s.install_date = $install_date
+    RETURN s
+"""
+
+CREATE_CROP_SPECIES_CYPHER = """
+    MERGE (s:CropSpecies {name: $name})
+    SET s.optimal_temp_range = $optimal_temp_range,
+        s.drought_tolerance = $drought_tolerance
+    RETURN s
+"""
+
+CREATE_ADVISORY_RULE_CYPHER = """
+    MERGE (r:AdvisoryRule {rule_id: $rule_id})
+    SET r.description = $description,
+        r.priority = $priority,
+        r.conditions = $conditions,
+        r.action = $action
+    RETURN r
+"""
+
+LINK_FARMER_OWNS_FARM_CYPHER = """
+    MATCH (farmer:Farmer {farmer_id: $farmer_id})
+    MATCH (farm:Farm {farm_id: $farm_id})
+    MERGE (farmer)-[:OWNS]->(farm)
+"""
+
+LINK_FARM_CONTAINS_FIELD_CYPHER = """
+    MATCH (farm:Farm {farm_id: $farm_id})
+    MATCH (field:Field {field_id: $field_id})
+    MERGE (farm)-[:CONTAINS]->(field)
+"""
+
+LINK_FIELD_HAS_SENSOR_CYPHER = """
+    MATCH (field:Field {field_id: $field_id})
+    MATCH (sensor:Sensor {sensor_id: $sensor_id})
+    MERGE (field)-[:HAS_SENSOR]->(sensor)
+"""
+
+LINK_FIELD_HAS_SPECIES_CYPHER = """
+    MATCH (field:Field {field_id: $field_id})
+    MATCH (species:CropSpecies {name: $species_name})
+    MERGE (field)-[:HAS_SPECIES]->(species)
+"""
+
+LINK_FIELD_RECEIVED_TREATMENT_CYPHER = """
+    MATCH (field:Field {field_id: $field_id})
+    MERGE (t:Treatment {type: $treatment_type, date: $date, field_id: $field_id})
+    SET t.details = $details
+    MERGE (field)-[:RECEIVED_TREATMENT]->(t)
+"""
+
+LINK_RULE_APPLIES_TO_FIELD_CYPHER = """
+    MATCH (rule:AdvisoryRule {rule_id: $rule_id})
+    MATCH (field:Field {field_id: $field_id})
+    MERGE (rule)-[:APPLIES_TO]->(field)
+"""
+
+LINK_RULE_APPLIES_TO_SPECIES_CYPHER = """
+    MATCH (rule:AdvisoryRule {rule_id: $rule_id})
+    MATCH (species:CropSpecies {name: $species_name})
+    MERGE (rule)-[:APPLIES_TO]->(species)
+"""
+
+FIND_FIELDS_BY_FARMER_CYPHER = """
+    MATCH (farmer:Farmer {farmer_id: $farmer_id})-[:OWNS]->(farm:Farm)-[:CONTAINS]->(field:Field)
+    RETURN field.field_id as field_id, field.name as name
+"""
+
+FIND_FIELDS_WITH_SAME_TREATMENT_CYPHER = """
+    MATCH (farmer:Farmer {farmer_id: $farmer_id})-[:OWNS]->(farm:Farm)-[:CONTAINS]->(field:Field)
+    MATCH (field)-[:RECEIVED_TREATMENT]->(t:Treatment {type: $treatment_type})
+    WHERE t.date > $cutoff
+    RETURN field.field_id as field_id, field.name as name, t.date as treatment_date
+    ORDER BY t.date DESC
+"""
+
+# Every field of the farmer, once per matching treatment (treatment columns null if none)
+FIND_FARMER_FIELDS_WITH_TREATMENTS_CYPHER = """
+    MATCH (farmer:Farmer {farmer_id: $farmer_id})-[:OWNS]->(farm:Farm)-[:CONTAINS]->(field:Field)
+    OPTIONAL MATCH (field)-[:RECEIVED_TREATMENT]->(t:Treatment)
+    WHERE t.type IN $treatment_types AND t.date > $cutoff
+    RETURN field.field_id as field_id, field.name as name,
+           t.type as treatment_type, t.date as treatment_date
+    ORDER BY t.date DESC
+"""
+
+GET_APPLICABLE_RULES_FOR_FIELD_CYPHER = """
+    MATCH (field:Field {field_id: $field_id})
+    OPTIONAL MATCH (rule:AdvisoryRule)-[:APPLIES_TO]->(field)
+    OPTIONAL MATCH (field)-[:HAS_SPECIES]->(species:CropSpecies)
+    OPTIONAL MATCH (rule2:AdvisoryRule)-[:APPLIES_TO]->(species)
+    WITH field, collect(DISTINCT rule) + collect(DISTINCT rule2) as rules
+    UNWIND rules as r
+    WITH r WHERE r IS NOT NULL
+    RETURN DISTINCT r.rule_id as rule_id, r.description as description, 
+           r.priority as priority, r.conditions as conditions, r.action as action
+    ORDER BY r.priority DESC
+"""
+
+FIND_HIGH_RISK_FIELDS_WITH_HISTORY_CYPHER = """
+    MATCH (field:Field)-[:HAS_SENSOR]->(sensor:Sensor)
+    WHERE field.slope_degrees > $risk_threshold
+    OPTIONAL MATCH (field)-[:RECEIVED_TREATMENT]->(t:Treatment)
+    RETURN field.field_id as field_id, field.name as name, 
+           field.slope_degrees as slope,
+           collect({type: t.type, date: t.date}) as treatments
+    ORDER BY field.slope_degrees DESC
+"""
+
+CREATE_FARMERS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (f:Farmer {farmer_id: row.farmer_id})
+    SET f.name = row.name,
+        f.email = row.email
+"""
+
+CREATE_FARMS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (f:Farm {farm_id: row.farm_id})
+    SET f.name = row.name,
+        f.location = row.location,
+        f.area_hectares = row.area_hectares
+"""
+
+CREATE_FIELDS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (f:Field {field_id: row.field_id})
+    SET f.name = row.name,
+        f.area_hectares = row.area_hectares,
+        f.soil_type = row.soil_type,
+        f.slope_degrees = row.slope
+"""
+
+CREATE_CROP_SPECIES_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (s:CropSpecies {name: row.name})
+    SET s.optimal_temp_range = row.optimal_temp_range,
+        s.drought_tolerance = row.drought_tolerance
+"""
+
+LINK_FARMERS_OWN_FARMS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (farmer:Farmer {farmer_id: row.farmer_id})
+    MATCH (farm:Farm {farm_id: row.farm_id})
+    MERGE (farmer)-[:OWNS]->(farm)
+"""
+
+LINK_FARMS_CONTAIN_FIELDS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (farm:Farm {farm_id: row.farm_id})
+    MATCH (field:Field {field_id: row.field_id})
+    MERGE (farm)-[:CONTAINS]->(field)
+"""
+
+CREATE_ADVISORY_RULES_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (r:AdvisoryRule {rule_id: row.rule_id})
+    SET r.description = row.description,
+        r.priority = row.priority,
+        r.conditions = row.conditions,
+        r.action = row.action
+"""
+
+LINK_FIELDS_RECEIVED_TREATMENTS_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (field:Field {field_id: row.field_id})
+    MERGE (t:Treatment {type: row.treatment_type, date: row.date, field_id: row.field_id})
+    SET t.details = row.details
+    MERGE (field)-[:RECEIVED_TREATMENT]->(t)
+"""
+
+LINK_RULES_APPLY_TO_SPECIES_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (rule:AdvisoryRule {rule_id: row.rule_id})
+    MATCH (species:CropSpecies {name: row.species_name})
+    MERGE (rule)-[:APPLIES_TO]->(species)
+"""
+
+LINK_FIELDS_HAVE_SPECIES_BULK_CYPHER = """
+    UNWIND $rows AS row
+    MATCH (field:Field {field_id: row.field_id})
+    MATCH (species:CropSpecies {name: row.species_name})
+    MERGE (field)-[:HAS_SPECIES]->(species)
+"""
 
 
 class PastureNeo4jManager:
     """Manage Neo4j graph operations."""
     
-    def __init__(self, uri="bolt://localhost:7687", user="neo4j", password="password"):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri="bolt://localhost:7687", user="neo4j", password="password", driver=None,
+                 max_connection_pool_size=MAX_CONNECTION_POOL_SIZE,
+                 connection_acquisition_timeout=CONNECTION_ACQUISITION_TIMEOUT):
+        # Use the shared driver unless one is passed in; neither is closed by close()
+        self.driver = driver if driver is not None else get_driver(
+            uri, user, password, max_connection_pool_size, connection_acquisition_timeout
+        )
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._executor = None  # Created by the first run_concurrently() call
+    
+    def _session(self):
+        """Return this thread's cached session, opening it on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.driver.session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+    
+    def run_concurrently(self, calls):
+        """
+        Run independent (method_name, kwargs) read calls at once and return their
+        results in call order. The workers are long-lived and each keeps its own
+        session on the shared driver pool, so the round-trips overlap instead of adding up.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=CONCURRENT_READ_WORKERS)
+        futures = [self._executor.submit(getattr(self, name), **kwargs) for name, kwargs in calls]
+        return [future.result() for future in futures]
     
     def close(self):
-        self.driver.close()
+        """Close this manager's sessions; the driver stays open for other managers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
     
     def init_schema(self):
         """Initialize constraints and indexes."""
-        with self.driver.session() as session:
-            # Create constraints
-            constraints = [
-                "CREATE CONSTRAINT farm_id IF NOT EXISTS FOR (f:Farm) REQUIRE f.farm_id IS UNIQUE",
-                "CREATE CONSTRAINT field_id IF NOT EXISTS FOR (f:Field) REQUIRE f.field_id IS UNIQUE",
-                "CREATE CONSTRAINT farmer_id IF NOT EXISTS FOR (f:Farmer) REQUIRE f.farmer_id IS UNIQUE",
-                "CREATE CONSTRAINT sensor_id IF NOT EXISTS FOR (s:Sensor) REQUIRE s.sensor_id IS UNIQUE",
-                "CREATE CONSTRAINT species_name IF NOT EXISTS FOR (s:CropSpecies) REQUIRE s.name IS UNIQUE",
-                "CREATE CONSTRAINT rule_id IF NOT EXISTS FOR (r:AdvisoryRule) REQUIRE r.rule_id IS UNIQUE"
-            ]
-            
-            for constraint in constraints:
+        # All statements are IF NOT EXISTS, so one schema transaction is safe to rerun
+        def _create_constraints(tx):
+            for constraint in SCHEMA_CONSTRAINTS:
+                tx.run(constraint).consume()
+        
+        session = self._session()
+        try:
+            session.execute_write(_create_constraints)
+        except Neo4jError as e:
+            # One conflicting statement (e.g. an equivalent constraint under another
+            # name) rolls back the whole transaction, so apply them one at a time
+            print(f"Schema transaction failed ({e}); applying statements individually")
+            for constraint in SCHEMA_CONSTRAINTS:
                 try:
-                    session.run(constraint)
+                    session.run(constraint).consume()
                 except Exception as e:
                     print(f"Constraint already exists or error: {e}")
-            
-            print("Neo4j schema initialized")
+        
+        print("Neo4j schema initialized")
     
     # ===== Node Creation =====
     
     def create_farm(self, farm_id, name, location, area_hectares):
         """Create a Farm node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (f:Farm {farm_id: $farm_id})
-                SET f.name = $name,
-                    f.location = $location,
-                    f.area_hectares = $area_hectares
-                RETURN f
-            """, farm_id=farm_id, name=name, location=location, area_hectares=area_hectares)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_FARM_CYPHER, farm_id=farm_id, name=name, location=location, area_hectares=area_hectares)
+        return result.single()[0]
     
     def create_field(self, field_id, name, area_hectares, soil_type, slope):
         """Create a Field node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (f:Field {field_id: $field_id})
-                SET f.name = $name,
-                    f.area_hectares = $area_hectares,
-                    f.soil_type = $soil_type,
-                    f.slope_degrees = $slope
-                RETURN f
-            """, field_id=field_id, name=name, area_hectares=area_hectares, 
-                 soil_type=soil_type, slope=slope)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_FIELD_CYPHER, field_id=field_id, name=name, area_hectares=area_hectares,
+                             soil_type=soil_type, slope=slope)
+        return result.single()[0]
     
     def create_farmer(self, farmer_id, name, email):
         """Create a Farmer node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (f:Farmer {farmer_id: $farmer_id})
-                SET f.name = $name,
-                    f.email = $email
-                RETURN f
-            """, farmer_id=farmer_id, name=name, email=email)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_FARMER_CYPHER, farmer_id=farmer_id, name=name, email=email)
+        return result.single()[0]
     
     def create_sensor(self, sensor_id, sensor_type, install_date):
         """Create a Sensor node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (s:Sensor {sensor_id: $sensor_id})
-                SET s.type = $sensor_type,
-                    s.install_date = $install_date
-                RETURN s
-            """, sensor_id=sensor_id, sensor_type=sensor_type, install_date=install_date)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_SENSOR_CYPHER, sensor_id=sensor_id, sensor_type=sensor_type, install_date=install_date)
+        return result.single()[0]
     
     def create_crop_species(self, name, optimal_temp_range, drought_tolerance):
         """Create a CropSpecies node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (s:CropSpecies {name: $name})
-                SET s.optimal_temp_range = $optimal_temp_range,
-                    s.drought_tolerance = $drought_tolerance
-                RETURN s
-            """, name=name, optimal_temp_range=optimal_temp_range, 
-                 drought_tolerance=drought_tolerance)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_CROP_SPECIES_CYPHER, name=name, optimal_temp_range=optimal_temp_range,
+                             drought_tolerance=drought_tolerance)
+        return result.single()[0]
     
     def create_advisory_rule(self, rule_id, description, priority, conditions, action):
         """Create an AdvisoryRule node."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MERGE (r:AdvisoryRule {rule_id: $rule_id})
-                SET r.description = $description,
-                    r.priority = $priority,
-                    r.conditions = $conditions,
-                    r.action = $action
-                RETURN r
-            """, rule_id=rule_id, description=description, priority=priority,
-                 conditions=conditions, action=action)
-            return result.single()[0]
+        session = self._session()
+        result = session.run(CREATE_ADVISORY_RULE_CYPHER, rule_id=rule_id, description=description, priority=priority,
+                             conditions=conditions, action=action)
+        return result.single()[0]
     
     # ===== Relationship Creation =====
     
     def link_farmer_owns_farm(self, farmer_id, farm_id):
         """Create OWNS relationship between Farmer and Farm."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (farmer:Farmer {farmer_id: $farmer_id})
-                MATCH (farm:Farm {farm_id: $farm_id})
-                MERGE (farmer)-[:OWNS]->(farm)
-            """, farmer_id=farmer_id, farm_id=farm_id)
+        session = self._session()
+        session.run(LINK_FARMER_OWNS_FARM_CYPHER, farmer_id=farmer_id, farm_id=farm_id).consume()
     
     def link_farm_contains_field(self, farm_id, field_id):
         """Create CONTAINS relationship between Farm and Field."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (farm:Farm {farm_id: $farm_id})
-                MATCH (field:Field {field_id: $field_id})
-                MERGE (farm)-[:CONTAINS]->(field)
-            """, farm_id=farm_id, field_id=field_id)
+        session = self._session()
+        session.run(LINK_FARM_CONTAINS_FIELD_CYPHER, farm_id=farm_id, field_id=field_id).consume()
     
     def link_field_has_sensor(self, field_id, sensor_id):
         """Create HAS_SENSOR relationship."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (field:Field {field_id: $field_id})
-                MATCH (sensor:Sensor {sensor_id: $sensor_id})
-                MERGE (field)-[:HAS_SENSOR]->(sensor)
-            """, field_id=field_id, sensor_id=sensor_id)
+        session = self._session()
+        session.run(LINK_FIELD_HAS_SENSOR_CYPHER, field_id=field_id, sensor_id=sensor_id).consume()
     
     def link_field_has_species(self, field_id, species_name):
         """Create HAS_SPECIES relationship."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (field:Field {field_id: $field_id})
-                MATCH (species:CropSpecies {name: $species_name})
-                MERGE (field)-[:HAS_SPECIES]->(species)
-            """, field_id=field_id, species_name=species_name)
+        session = self._session()
+        session.run(LINK_FIELD_HAS_SPECIES_CYPHER, field_id=field_id, species_name=species_name).consume()
     
     def link_field_received_treatment(self, field_id, treatment_type, date, details=None):
-        """Create RECEIVED_TREATMENT relationship with properties."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (field:Field {field_id: $field_id})
-                MERGE (t:Treatment {type: $treatment_type, date: $date, field_id: $field_id})
-                SET t.details = $details
-                MERGE (field)-[:RECEIVED_TREATMENT]->(t)
-            """, field_id=field_id, treatment_type=treatment_type, date=date, details=details)
+        """Create RECEIVED_TREATMENT relationship with properties (date is a datetime)."""
+        session = self._session()
+        session.run(LINK_FIELD_RECEIVED_TREATMENT_CYPHER, field_id=field_id, treatment_type=treatment_type,
+                    date=date, details=details).consume()
     
     def link_rule_applies_to_field(self, rule_id, field_id):
         """Create APPLIES_TO relationship between AdvisoryRule and Field."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (rule:AdvisoryRule {rule_id: $rule_id})
-                MATCH (field:Field {field_id: $field_id})
-                MERGE (rule)-[:APPLIES_TO]->(field)
-            """, rule_id=rule_id, field_id=field_id)
+        session = self._session()
+        session.run(LINK_RULE_APPLIES_TO_FIELD_CYPHER, rule_id=rule_id, field_id=field_id).consume()
     
     def link_rule_applies_to_species(self, rule_id, species_name):
         """Create APPLIES_TO relationship between AdvisoryRule and CropSpecies."""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (rule:AdvisoryRule {rule_id: $rule_id})
-                MATCH (species:CropSpecies {name: $species_name})
-                MERGE (rule)-[:APPLIES_TO]->(species)
-            """, rule_id=rule_id, species_name=species_name)
+        session = self._session()
+        session.run(LINK_RULE_APPLIES_TO_SPECIES_CYPHER, rule_id=rule_id, species_name=species_name).consume()
+    
+    # ===== Bulk Operations (UNWIND) =====
+    
+    def _write_rows(self, query, rows):
+        """Run an UNWIND $rows write query, one transaction per BULK_CHUNK_SIZE rows."""
+        session = self._session()
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_CHUNK_SIZE]
+            session.execute_write(lambda tx: tx.run(query, rows=chunk).consume())
+    
+    def create_farmers_bulk(self, farmers):
+        """Create Farmer nodes from dicts with farmer_id, name, email."""
+        self._write_rows(CREATE_FARMERS_BULK_CYPHER, farmers)
+    
+    def create_farms_bulk(self, farms):
+        """Create Farm nodes from dicts with farm_id, name, location, area_hectares."""
+        self._write_rows(CREATE_FARMS_BULK_CYPHER, farms)
+    
+    def create_fields_bulk(self, fields):
+        """Create Field nodes from dicts with field_id, name, area_hectares, soil_type, slope."""
+        self._write_rows(CREATE_FIELDS_BULK_CYPHER, fields)
+    
+    def create_crop_species_bulk(self, species):
+        """Create CropSpecies nodes from dicts with name, optimal_temp_range, drought_tolerance."""
+        self._write_rows(CREATE_CROP_SPECIES_BULK_CYPHER, species)
+    
+    def link_farmers_own_farms_bulk(self, pairs):
+        """Create OWNS relationships from dicts with farmer_id, farm_id."""
+        self._write_rows(LINK_FARMERS_OWN_FARMS_BULK_CYPHER, pairs)
+    
+    def link_farms_contain_fields_bulk(self, pairs):
+        """Create CONTAINS relationships from dicts with farm_id, field_id."""
+        self._write_rows(LINK_FARMS_CONTAIN_FIELDS_BULK_CYPHER, pairs)
+    
+    def link_fields_have_species_bulk(self, pairs):
+        """Create HAS_SPECIES relationships from dicts with field_id, species_name."""
+        self._write_rows(LINK_FIELDS_HAVE_SPECIES_BULK_CYPHER, pairs)
+    
+    def create_advisory_rules_bulk(self, rules):
+        """Create AdvisoryRule nodes from dicts with rule_id, description, priority, conditions, action."""
+        self._write_rows(CREATE_ADVISORY_RULES_BULK_CYPHER, rules)
+    
+    def link_fields_received_treatments_bulk(self, treatments):
+        """Create Treatment nodes and RECEIVED_TREATMENT relationships from dicts
+        with field_id, treatment_type, date (a datetime), details."""
+        self._write_rows(LINK_FIELDS_RECEIVED_TREATMENTS_BULK_CYPHER, treatments)
+    
+    def link_rules_apply_to_species_bulk(self, pairs):
+        """Create APPLIES_TO relationships from dicts with rule_id, species_name."""
+        self._write_rows(LINK_RULES_APPLY_TO_SPECIES_BULK_CYPHER, pairs)
     
     # ===== Query Operations =====
     
+    def _read_rows(self, query, **params):
+        """Run a read query in a managed read transaction and return the records as dicts."""
+        def _read(tx):
+            return [record.data() for record in tx.run(query, **params)]
+        return self._session().execute_read(_read)
+    
     def find_fields_by_farmer(self, farmer_id):
         """Find all fields owned by a farmer."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (farmer:Farmer {farmer_id: $farmer_id})-[:OWNS]->(farm:Farm)-[:CONTAINS]->(field:Field)
-                RETURN field.field_id as field_id, field.name as name
-            """, farmer_id=farmer_id)
-            return [dict(record) for record in result]
+        return self._read_rows(FIND_FIELDS_BY_FARMER_CYPHER, farmer_id=farmer_id)
     
     def find_fields_with_same_treatment(self, farmer_id, treatment_type, days=365):
         """Find fields that received same treatment and belong to same farmer."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (farmer:Farmer {farmer_id: $farmer_id})-[:OWNS]->(farm:Farm)-[:CONTAINS]->(field:Field)
-                MATCH (field)-[:RECEIVED_TREATMENT]->(t:Treatment {type: $treatment_type})
-                WHERE datetime(t.date) > datetime() - duration({days: $days})
-                RETURN field.field_id as field_id, field.name as name, t.date as treatment_date
-                ORDER BY t.date DESC
-            """, farmer_id=farmer_id, treatment_type=treatment_type, days=days)
-            return [dict(record) for record in result]
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return self._read_rows(FIND_FIELDS_WITH_SAME_TREATMENT_CYPHER, farmer_id=farmer_id,
+                               treatment_type=treatment_type, cutoff=cutoff)
+    
+    def find_farmer_fields_with_treatments(self, farmer_id, treatment_types, days=365):
+        """All of a farmer's fields plus their recent treatments of the given types, in one query."""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return self._read_rows(FIND_FARMER_FIELDS_WITH_TREATMENTS_CYPHER, farmer_id=farmer_id,
+                               treatment_types=list(treatment_types), cutoff=cutoff)
     
     def get_applicable_rules_for_field(self, field_id):
         """Get all advisory rules applicable to a field."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (field:Field {field_id: $field_id})
-                OPTIONAL MATCH (rule:AdvisoryRule)-[:APPLIES_TO]->(field)
-                OPTIONAL MATCH (field)-[:HAS_SPECIES]->(species:CropSpecies)
-                OPTIONAL MATCH (rule2:AdvisoryRule)-[:APPLIES_TO]->(species)
-                WITH field, collect(DISTINCT rule) + collect(DISTINCT rule2) as rules
-                UNWIND rules as r
-                WITH r WHERE r IS NOT NULL
-                RETURN DISTINCT r.rule_id as rule_id, r.description as description, 
-                       r.priority as priority, r.conditions as conditions, r.action as action
-                ORDER BY r.priority DESC
-            """, field_id=field_id)
-            return [dict(record) for record in result]
+        return self._read_rows(GET_APPLICABLE_RULES_FOR_FIELD_CYPHER, field_id=field_id)
     
     def find_high_risk_fields_with_history(self, risk_threshold=0.7):
         """Find fields with sensors showing issues and their treatment history."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (field:Field)-[:HAS_SENSOR]->(sensor:Sensor)
-                WHERE field.slope_degrees > $risk_threshold
-                OPTIONAL MATCH (field)-[:RECEIVED_TREATMENT]->(t:Treatment)
-                RETURN field.field_id as field_id, field.name as name, 
-                       field.slope_degrees as slope,
-                       collect({type: t.type, date: t.date}) as treatments
-                ORDER BY field.slope_degrees DESC
-            """, risk_threshold=risk_threshold)
-            return [dict(record) for record in result]
+        return self._read_rows(FIND_HIGH_RISK_FIELDS_WITH_HISTORY_CYPHER, risk_threshold=risk_threshold)
 
 
 # Example Cypher queries as strings
@@ -242,7 +525,7 @@ EXAMPLE_QUERIES = {
     
     "find_fields_same_treatment": """
         MATCH (f:Field)-[:RECEIVED_TREATMENT]->(t:Treatment {type: 'fertilizer'})
-        WHERE datetime(t.date) > datetime() - duration({months: 12})
+        WHERE t.date > localdatetime() - duration({months: 12})
         WITH f.field_id as field_id, count(t) as treatment_count
         WHERE treatment_count > 0
         RETURN field_id, treatment_count
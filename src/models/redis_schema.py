@@ -4,43 +4,109 @@ Uses hashes for field metrics, streams for alerts, sorted sets for scheduling.
 """
 
 import redis
-import json
+import orjson
+import msgpack
+import lz4.frame
 from datetime import datetime, timedelta
 
 
+# HSET + EXPIRE as one atomic server-side call.
+# KEYS[1] = hash key, ARGV[1] = TTL seconds, ARGV[2..] = field, value pairs
+HSET_EXPIRE_LUA = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _msgpack_default(obj):
+    """Encode values msgpack has no type for (datetimes as ISO strings)."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(obj).__name__}")
+
+
 class PastureRedisManager:
-    """Manage Redis operations for pasture management system."""
+    """
+    Manage Redis operations for pasture management system.
     
-    def __init__(self, host='localhost', port=6379, db=0):
-        self.client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+    Per-field keys wrap the field_id in a hash tag (field:{field_001},
+    risk:{field_001}, alerts:{field_001}) so Redis Cluster places all of a
+    field's keys in one slot and they can share a pipeline or MULTI.
+    """
+    
+    def __init__(self, host='localhost', port=6379, db=0, max_connections=64):
+        pool = redis.ConnectionPool(
+            host=host, port=port, db=db,
+            max_connections=max_connections, decode_responses=True
+        )
+        self.client = redis.Redis(connection_pool=pool)
+        
+        # Undecoded client for binary (msgpack + LZ4) cache payloads
+        raw_pool = redis.ConnectionPool(
+            host=host, port=port, db=db,
+            max_connections=max_connections, decode_responses=False
+        )
+        self.raw_client = redis.Redis(connection_pool=raw_pool)
+        
+        # Sent with EVALSHA once loaded
+        self._hset_expire = self.client.register_script(HSET_EXPIRE_LUA)
+    
+    def _hset_with_ttl(self, key, mapping, ttl_seconds, client=None):
+        """Write a hash and its TTL in one script call (optionally on a pipeline)."""
+        args = [ttl_seconds]
+        for field, value in mapping.items():
+            args.extend((field, value))
+        self._hset_expire(keys=[key], args=args, client=client)
     
     # ===== Field Metrics (Hashes) =====
     
     def update_field_metrics(self, field_id: str, metrics: dict):
         """
         Update latest metrics for a field using Redis hash.
-        Key pattern: field:{field_id}
+        Key pattern: field:{<field_id>}
         """
-        key = f"field:{field_id}"
+        key = f"field:{{{field_id}}}"
         # Add timestamp
         metrics['updated_at'] = datetime.utcnow().isoformat()
         
-        # Store each metric as a hash field
-        self.client.hset(key, mapping=metrics)
-        
-        # Set expiration to 7 days
-        self.client.expire(key, 7 * 24 * 3600)
+        # Store each metric as a hash field and set expiration to 7 days
+        self._hset_with_ttl(key, metrics, 7 * 24 * 3600)
         
         return key
     
+    def update_field_metrics_bulk(self, metrics_by_field: dict):
+        """
+        Update latest metrics for many fields in one pipelined round-trip.
+        metrics_by_field maps field_id -> metrics dict.
+        """
+        updated_at = datetime.utcnow().isoformat()
+        pipe = self.client.pipeline(transaction=False)
+        
+        for field_id, metrics in metrics_by_field.items():
+            key = f"field:{{{field_id}}}"
+            self._hset_with_ttl(key, {**metrics, 'updated_at': updated_at}, 7 * 24 * 3600, client=pipe)
+        
+        pipe.execute()
+    
     def get_field_metrics(self, field_id: str):
         """Get all metrics for a field."""
-        key = f"field:{field_id}"
+        key = f"field:{{{field_id}}}"
         return self.client.hgetall(key)
     
+    def get_field_metric_values(self, field_ids: list, metric_names: list):
+        """
+        Get selected metrics for many fields in one pipelined round-trip.
+        Returns one list of values (None where missing) per field, in metric_names order.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for field_id in field_ids:
+            pipe.hmget(f"field:{{{field_id}}}", metric_names)
+        return pipe.execute()
+    
     def get_field_metric(self, field_id: str, metric_name: str):
         """Get a specific metric for a field."""
-        key = f"field:{field_id}"
+        key = f"field:{{{field_id}}}"
         return self.client.hget(key, metric_name)
     
     # ===== Alerts (Streams) =====
@@ -49,7 +115,7 @@ class PastureRedisManager:
                      threshold: float, severity: str = 'warning'):
         """
         Publish an alert to Redis stream.
-        Stream name: alerts
+        Stream names: alerts (all fields), alerts:{<field_id>} (per field)
         """
         alert_data = {
             'field_id': field_id,
@@ -60,13 +126,43 @@ class PastureRedisManager:
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        message_id = self.client.xadd('alerts', alert_data)
-        
-        # Trim stream to last 10000 entries
-        self.client.xtrim('alerts', maxlen=10000, approximate=True)
+        # Trim streams to last 10000 / 1000 entries as part of the adds
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xadd('alerts', alert_data, maxlen=10000, approximate=True)
+        pipe.xadd(f"alerts:{{{field_id}}}", alert_data, maxlen=1000, approximate=True)
+        message_id, _ = pipe.execute()
         
         return message_id
     
+    def publish_alerts(self, alerts: list):
+        """
+        Publish many alerts in one pipelined round-trip.
+        Each alert is a dict with field_id, alert_type, value, threshold, severity.
+        """
+        if not alerts:
+            return []
+        
+        timestamp = datetime.utcnow().isoformat()
+        pipe = self.client.pipeline(transaction=False)
+        
+        for alert in alerts:
+            alert_data = {
+                'field_id': alert['field_id'],
+                'type': alert['alert_type'],
+                'value': str(alert['value']),
+                'threshold': str(alert['threshold']),
+                'severity': alert.get('severity', 'warning'),
+                'timestamp': timestamp
+            }
+            pipe.xadd('alerts', alert_data)
+            pipe.xadd(f"alerts:{{{alert['field_id']}}}", alert_data, maxlen=1000, approximate=True)
+        
+        # Trim stream to last 10000 entries once for the whole batch
+        pipe.xtrim('alerts', maxlen=10000, approximate=True)
+        
+        # Message ids from the shared stream (every other reply, trim excluded)
+        return pipe.execute()[:-1:2]
+    
     def read_alerts(self, count=10, block_ms=None):
         """Read recent alerts from stream."""
         streams = {'alerts': '0'} if block_ms is None else {'alerts': '$'}
@@ -80,25 +176,22 @@ class PastureRedisManager:
         return results
     
     def get_alerts_for_field(self, field_id: str, count=10):
-        """Get recent alerts for a specific field."""
-        all_alerts = self.client.xrevrange('alerts', '+', '-', count=100)
-        field_alerts = [
-            alert for alert in all_alerts 
-            if alert[1].get('field_id') == field_id
-        ]
-        return field_alerts[:count]
+        """Get recent alerts for a specific field from its own stream."""
+        return self.client.xrevrange(f"alerts:{{{field_id}}}", '+', '-', count=count)
     
     # ===== Maintenance Schedule (Sorted Sets) =====
     
     def schedule_maintenance(self, task_id: str, task_data: dict, scheduled_time: datetime):
         """
         Schedule a maintenance task using sorted set.
-        Score = timestamp for ordering
+        Score = timestamp for ordering; payload kept in the maintenance_payload hash
         """
         score = scheduled_time.timestamp()
-        value = json.dumps(task_data)
         
-        self.client.zadd('maintenance_schedule', {f"{task_id}:{value}": score})
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zadd('maintenance_schedule', {task_id: score})
+        pipe.hset('maintenance_payload', task_id, orjson.dumps(task_data))
+        pipe.execute()
         return task_id
     
     def get_upcoming_maintenance(self, days=7):
@@ -107,13 +200,16 @@ class PastureRedisManager:
         future = (datetime.utcnow() + timedelta(days=days)).timestamp()
         
         tasks = self.client.zrangebyscore('maintenance_schedule', now, future, withscores=True)
+        if not tasks:
+            return []
+        
+        payloads = self.client.hmget('maintenance_payload', [task_id for task_id, _ in tasks])
         
         result = []
-        for task_data, score in tasks:
-            task_id, data = task_data.split(':', 1)
+        for (task_id, score), data in zip(tasks, payloads):
             result.append({
                 'task_id': task_id,
-                'data': json.loads(data),
+                'data': orjson.loads(data) if data else {},
                 'scheduled_time': datetime.fromtimestamp(score).isoformat()
             })
         
@@ -121,55 +217,50 @@ class PastureRedisManager:
     
     def complete_maintenance(self, task_id: str):
         """Remove completed maintenance task."""
-        # Find and remove tasks matching task_id
-        tasks = self.client.zrange('maintenance_schedule', 0, -1)
-        for task in tasks:
-            if task.startswith(f"{task_id}:"):
-                self.client.zrem('maintenance_schedule', task)
-                return True
-        return False
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrem('maintenance_schedule', task_id)
+        pipe.hdel('maintenance_payload', task_id)
+        removed, _ = pipe.execute()
+        return removed > 0
     
     # ===== Risk Assessment Cache =====
     
     def cache_risk_assessment(self, field_id: str, risk_score: float, 
                              factors: dict, ttl_seconds=300):
         """Cache risk assessment results."""
-        key = f"risk:{field_id}"
+        key = f"risk:{{{field_id}}}"
         data = {
             'risk_score': risk_score,
-            'factors': json.dumps(factors),
+            'factors': orjson.dumps(factors),
             'computed_at': datetime.utcnow().isoformat()
         }
         
-        self.client.hset(key, mapping=data)
-        self.client.expire(key, ttl_seconds)
+        self._hset_with_ttl(key, data, ttl_seconds)
         
         return key
     
     def get_risk_assessment(self, field_id: str):
         """Get cached risk assessment."""
-        key = f"risk:{field_id}"
+        key = f"risk:{{{field_id}}}"
         data = self.client.hgetall(key)
         
         if data and 'factors' in data:
-            data['factors'] = json.loads(data['factors'])
+            data['factors'] = orjson.loads(data['factors'])
         
         return data if data else None
     
     # ===== Analytics Cache =====
     
     def cache_query_result(self, query_key: str, result: dict, ttl_seconds=600):
-        """Cache expensive query results."""
-        self.client.setex(
-            f"cache:query:{query_key}",
-            ttl_seconds,
-            json.dumps(result)
-        )
+        """Cache expensive query results (msgpack-encoded, LZ4-compressed)."""
+        payload = lz4.frame.compress(msgpack.packb(result, default=_msgpack_default))
+        self.raw_client.setex(f"cache:query:{query_key}", ttl_seconds, payload)
     
     def get_cached_query(self, query_key: str):
         """Get cached query result."""
-        result = self.client.get(f"cache:query:{query_key}")
-        return json.loads(result) if result else None
+        raw = self.raw_client.get(f"cache:query:{query_key}")
+        # strict_map_key=False: results may use int (or other non-str) dict keys
+        return msgpack.unpackb(lz4.frame.decompress(raw), strict_map_key=False) if raw else None
 
 
 # Example usage patterns